@@ -1,11 +1,12 @@
 from math import isnan
-from django.db import connection
+from django.db import connection, DataError
 
 import unittest
 if connection.vendor != 'postgresql':
     raise unittest.SkipTest('postgres only tests')
 
 from django.test import TestCase
+from django.contrib.postgres.fields import ArrayField
 from .models import PostgresFields, FieldUpdateNotNull, CustomField, FieldUpdateArray, TestCoverage
 from exampleapp.models import FieldUpdate, MultiSub, Child, Parent
 from psycopg2.extras import NumericRange, DateTimeTZRange, DateRange
@@ -13,7 +14,8 @@ import datetime
 import pytz
 import uuid
 from decimal import Decimal
-from fast_update.copy import get_encoder, register_fieldclass, Int, IntOrNone, array_factory
+from enum import Enum, IntEnum
+from fast_update.copy import get_encoder, register_fieldclass, Int, IntOrNone, array_factory, field_getter
 import json
 
 
@@ -204,20 +206,28 @@ class TestCopyUpdate(TestCase):
         self._single('f_binary')
         self._single_raise('f_binary', 'wrong', "expected types <class 'memoryview'>, <class 'bytes'> or None")
     
-    def test_binary_big(self):
+    def _binary_big(self, fields):
         # >64k
         data = b'1234567890' * 10000
         obj = FieldUpdate.objects.create()
         obj.f_binary = data
-        FieldUpdate.objects.copy_update([obj], ['f_binary'])
+        obj.f_decimal = Decimal('1.5')
+        FieldUpdate.objects.copy_update([obj], fields)
         self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_binary.tobytes(), data)
         # <64k
         data = b'1234567890' * 1000
         obj = FieldUpdate.objects.create()
         obj.f_binary = data
-        FieldUpdate.objects.copy_update([obj], ['f_binary'])
+        obj.f_decimal = Decimal('1.5')
+        FieldUpdate.objects.copy_update([obj], fields)
         self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_binary.tobytes(), data)
 
+    def test_binary_big(self):
+        self._binary_big(['f_binary', 'f_decimal'])  # TEXT format
+
+    def test_binary_big_binary_format(self):
+        self._binary_big(['f_binary'])
+
     def test_boolean(self):
         self._single('f_boolean')
         self._single_raise('f_boolean', 'wrong', "expected type <class 'bool'> or None")
@@ -226,6 +236,24 @@ class TestCopyUpdate(TestCase):
         self._single('f_char')
         self._single_raise('f_char', 123, "expected type <class 'str'> or None")
 
+    def test_char_str_enum(self):
+        class Choice(str, Enum):
+            A = 'a'
+        obj = FieldUpdate.objects.create()
+        obj.f_char = Choice.A
+        obj.f_decimal = Decimal('1.5')  # TEXT format
+        FieldUpdate.objects.copy_update([obj], ['f_char', 'f_decimal'])
+        self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_char, 'a')
+
+    def test_integer_int_enum(self):
+        class Choice(IntEnum):
+            A = 1
+        obj = FieldUpdate.objects.create()
+        obj.f_integer = Choice.A
+        obj.f_decimal = Decimal('1.5')  # TEXT format
+        FieldUpdate.objects.copy_update([obj], ['f_integer', 'f_decimal'])
+        self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_integer, 1)
+
     def test_date(self):
         self._single('f_date')
         self._single_raise('f_date', 'wrong', "expected type <class 'datetime.date'> or None")
@@ -297,23 +325,132 @@ class TestCopyUpdate(TestCase):
             for f in CU_FIELDS:
                 self.assertEqual(r[f], first[f])
 
-    def test_big_lazy(self):
+    def _big_lazy(self, fields):
         obj = FieldUpdate.objects.create()
         obj.f_binary = b'0' * 100000
         obj.f_text = 'x' * 100000
-        FieldUpdate.objects.copy_update([obj], ['f_binary', 'f_text'])
+        FieldUpdate.objects.copy_update([obj], fields)
         self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_binary.tobytes(), b'0' * 100000)
         self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_text, 'x' * 100000)
-    
-    def test_lazy_after_big(self):
+
+    def test_big_lazy(self):
+        self._big_lazy(['f_binary', 'f_text', 'f_decimal'])  # TEXT format
+
+    def test_big_lazy_binary_format(self):
+        self._big_lazy(['f_binary', 'f_text'])
+
+    def _lazy_after_big(self, fields):
         obj1 = FieldUpdate.objects.create()
         obj1.f_text = 'x' * 70000
         obj2 = FieldUpdate.objects.create()
         obj2.f_binary = b'0' * 100000
-        FieldUpdate.objects.copy_update([obj1, obj2], ['f_binary', 'f_text'])
+        FieldUpdate.objects.copy_update([obj1, obj2], fields)
         self.assertEqual(FieldUpdate.objects.get(pk=obj1.pk).f_text, 'x' * 70000)
         self.assertEqual(FieldUpdate.objects.get(pk=obj2.pk).f_binary.tobytes(), b'0' * 100000)
 
+    def test_lazy_after_big(self):
+        self._lazy_after_big(['f_binary', 'f_text', 'f_decimal'])  # TEXT format
+
+    def test_lazy_after_big_binary_format(self):
+        self._lazy_after_big(['f_binary', 'f_text'])
+
+    def test_binary_format_casts(self):
+        # values passing the encoder check without exact type match
+        class Choice(str, Enum):
+            A = 'a'
+        obj = FieldUpdate.objects.create()
+        obj.f_binary = memoryview(b'\x00\x80\xff')
+        obj.f_float = 42
+        obj.f_date = datetime.datetime(2022, 4, 1, 12, 30)
+        obj.f_char = Choice.A
+        FieldUpdate.objects.copy_update([obj], ['f_binary', 'f_float', 'f_date', 'f_char'])
+        obj = FieldUpdate.objects.get(pk=obj.pk)
+        self.assertEqual(obj.f_binary.tobytes(), b'\x00\x80\xff')
+        self.assertEqual(obj.f_float, 42.0)
+        self.assertEqual(obj.f_date, datetime.date(2022, 4, 1))
+        self.assertEqual(obj.f_char, 'a')
+
+    def test_binary_format_out_of_range(self):
+        obj = FieldUpdate.objects.create()
+        obj.f_smallinteger = 2 ** 15
+        self.assertRaisesMessage(DataError, 'field "f_smallinteger"',
+            lambda : FieldUpdate.objects.copy_update([obj], ['f_integer', 'f_smallinteger']))
+
+    def test_binary_format_float_overflow(self):
+        obj = FieldUpdate.objects.create()
+        obj.f_float = 10 ** 400
+        self.assertRaisesMessage(DataError, 'field "f_float"',
+            lambda : FieldUpdate.objects.copy_update([obj], ['f_float']))
+
+    def test_binary_format_bool_integer(self):
+        # bool is rejected for numbers as in TEXT format
+        obj = FieldUpdate.objects.create()
+        obj.f_integer = True
+        self.assertRaisesMessage(DataError, 'field "f_integer"',
+            lambda : FieldUpdate.objects.copy_update([obj], ['f_integer']))
+
+    def test_binary_format_bool_float(self):
+        obj = FieldUpdate.objects.create()
+        obj.f_float = True
+        self.assertRaisesMessage(DataError, 'field "f_float"',
+            lambda : FieldUpdate.objects.copy_update([obj], ['f_float']))
+
+    def test_binary_format_memoryview(self):
+        # bytea as loaded from the database
+        FieldUpdate.objects.create(f_binary=b'\x00\x80\xff')
+        obj = FieldUpdate.objects.get()
+        self.assertIsInstance(obj.f_binary, memoryview)
+        obj.f_binary = obj.f_binary[1:]
+        FieldUpdate.objects.copy_update([obj], ['f_binary'])
+        self.assertEqual(FieldUpdate.objects.get().f_binary.tobytes(), b'\x80\xff')
+        # non-contiguous
+        obj.f_binary = memoryview(b'\x00\x80\xff')[::2]
+        FieldUpdate.objects.copy_update([obj], ['f_binary'])
+        self.assertEqual(FieldUpdate.objects.get().f_binary.tobytes(), b'\x00\xff')
+
+    def test_generic_row_builder(self):
+        # force generic row builder as used for very wide tables
+        import fast_update.copy
+        old = fast_update.copy.MAX_GENERATED_COLUMNS
+        fast_update.copy.MAX_GENERATED_COLUMNS = 0
+        try:
+            self.test_updatefull_multiple()
+        finally:
+            fast_update.copy.MAX_GENERATED_COLUMNS = old
+
+    def test_unthreaded_big(self):
+        # big payloads without threading
+        import fast_update.copy
+        old = fast_update.copy.COPY_THREAD_THRESHOLD
+        fast_update.copy.COPY_THREAD_THRESHOLD = 10000000
+        try:
+            self.test_big_lazy()
+            self.test_lazy_after_big()
+            self.test_big_lazy_binary_format()
+            self.test_lazy_after_big_binary_format()
+        finally:
+            fast_update.copy.COPY_THREAD_THRESHOLD = old
+
+    def test_deferred_fields(self):
+        FieldUpdate.objects.create(f_char='a', f_integer=1)
+        obj = FieldUpdate.objects.only('f_char').get()
+        obj.f_char = 'b'
+        FieldUpdate.objects.copy_update([obj], ['f_char', 'f_integer'])
+        self.assertEqual(
+            list(FieldUpdate.objects.values_list('f_char', 'f_integer')),
+            [('b', 1)]
+        )
+
+    def test_field_getter_descriptors(self):
+        self.assertEqual(field_getter(FieldUpdate, ['f_char', 'f_integer'])(
+            FieldUpdate(f_char='a', f_integer=1)), ('a', 1))
+        # custom descriptors must not be bypassed by reading __dict__
+        class Custom:
+            f_char = property(lambda self: 'descriptor')
+        obj = Custom()
+        obj.__dict__.update(f_char='raw', f_integer=1)
+        self.assertEqual(field_getter(Custom, ['f_char', 'f_integer'])(obj), ('descriptor', 1))
+
 
 class TestCopyUpdateNotNull(TestCase):
     def _single(self, fieldname):
@@ -343,20 +480,28 @@ class TestCopyUpdateNotNull(TestCase):
         self._single('f_binary')
         self._single_raise('f_binary', 'wrong', "expected types <class 'memoryview'> or <class 'bytes'>")
     
-    def test_binary_big(self):
+    def _binary_big(self, fields):
         # >64k
         data = b'1234567890' * 10000
         obj = FieldUpdateNotNull.objects.create()
         obj.f_binary = data
-        FieldUpdateNotNull.objects.copy_update([obj], ['f_binary'])
+        obj.f_decimal = Decimal('1.5')
+        FieldUpdateNotNull.objects.copy_update([obj], fields)
         self.assertEqual(FieldUpdateNotNull.objects.get(pk=obj.pk).f_binary.tobytes(), data)
         # <64k
         data = b'1234567890' * 1000
         obj = FieldUpdateNotNull.objects.create()
         obj.f_binary = data
-        FieldUpdateNotNull.objects.copy_update([obj], ['f_binary'])
+        obj.f_decimal = Decimal('1.5')
+        FieldUpdateNotNull.objects.copy_update([obj], fields)
         self.assertEqual(FieldUpdateNotNull.objects.get(pk=obj.pk).f_binary.tobytes(), data)
 
+    def test_binary_big(self):
+        self._binary_big(['f_binary', 'f_decimal'])  # TEXT format
+
+    def test_binary_big_binary_format(self):
+        self._binary_big(['f_binary'])
+
     def test_boolean(self):
         self._single('f_boolean')
         self._single_raise('f_boolean', 'wrong', "expected type <class 'bool'>")
@@ -843,19 +988,26 @@ class TestCopyUpdateArray(TestCase):
 
 
 class TestCopyUpdateWickedText(TestCase):
-    def test_plain_bytes(self):
+    def _plain_bytes(self, fields):
         # skip \x00 as it is not allowed in postgres
         values = ''.join(chr(i) for i in range(1, 256))
         obj = FieldUpdate.objects.create()
         # full write
         obj.f_text = values
-        FieldUpdate.objects.copy_update([obj], ['f_text'])
+        FieldUpdate.objects.copy_update([obj], fields)
         self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_text, values)
         # single writes
         for v in values:
             obj.f_text = v
-            FieldUpdate.objects.copy_update([obj], ['f_text'])
+            FieldUpdate.objects.copy_update([obj], fields)
             self.assertEqual(FieldUpdate.objects.get(pk=obj.pk).f_text, v)
+        return values
+
+    def test_plain_bytes_binary_format(self):
+        self._plain_bytes(['f_text'])
+
+    def test_plain_bytes(self):
+        values = self._plain_bytes(['f_text', 'f_decimal'])  # TEXT format
         # array write singles
         obj_ar = FieldUpdateArray.objects.create()
         obj_ar.f_text = list(values)
@@ -870,7 +1022,7 @@ class TestCopyUpdateWickedText(TestCase):
         FieldUpdateArray.objects.copy_update([obj_ar], ['f_text2'])
         self.assertEqual(FieldUpdateArray.objects.get(pk=obj_ar.pk).f_text2, [list(values), [values] + [None]*254])
 
-    def test_blns(self):
+    def _blns(self, fields):
         # taken from https://github.com/minimaxir/big-list-of-naughty-strings
         from django.conf import settings
         from os import path
@@ -882,22 +1034,29 @@ class TestCopyUpdateWickedText(TestCase):
                 a.f_text = s
                 b.f_text = s
                 FieldUpdate.objects.bulk_update([a], ['f_text'])
-                FieldUpdate.objects.copy_update([b], ['f_text'])
+                FieldUpdate.objects.copy_update([b], fields)
                 self.assertEqual(
                     FieldUpdate.objects.get(pk=b.pk).f_text,
                     FieldUpdate.objects.get(pk=a.pk).f_text
                 )
-            # array write
-            a_ar = FieldUpdateArray.objects.create()
-            b_ar = FieldUpdateArray.objects.create()
-            a_ar.f_text = strings
-            b_ar.f_text = strings
-            FieldUpdateArray.objects.bulk_update([a_ar], ['f_text'])
-            FieldUpdateArray.objects.copy_update([b_ar], ['f_text'])
-            self.assertEqual(
-                FieldUpdateArray.objects.get(pk=b_ar.pk).f_text,
-                FieldUpdateArray.objects.get(pk=a_ar.pk).f_text
-            )
+        return strings
+
+    def test_blns_binary_format(self):
+        self._blns(['f_text'])
+
+    def test_blns(self):
+        strings = self._blns(['f_text', 'f_decimal'])  # TEXT format
+        # array write
+        a_ar = FieldUpdateArray.objects.create()
+        b_ar = FieldUpdateArray.objects.create()
+        a_ar.f_text = strings
+        b_ar.f_text = strings
+        FieldUpdateArray.objects.bulk_update([a_ar], ['f_text'])
+        FieldUpdateArray.objects.copy_update([b_ar], ['f_text'])
+        self.assertEqual(
+            FieldUpdateArray.objects.get(pk=b_ar.pk).f_text,
+            FieldUpdateArray.objects.get(pk=a_ar.pk).f_text
+        )
 
 
 class TestFieldRegistration(TestCase):
@@ -913,6 +1072,17 @@ class TestFieldRegistration(TestCase):
         self.assertEqual(get_encoder(f), Int)
         self.assertEqual(get_encoder(f_null), IntOrNone)
 
+    def test_reregister(self):
+        f = CustomField()
+        register_fieldclass(CustomField, Int, IntOrNone)
+        self.assertEqual(get_encoder(f), Int)
+        array_enc = get_encoder(ArrayField(CustomField()))
+        self.assertIs(get_encoder(ArrayField(CustomField())), array_enc)
+        # re-registration must not return cached encoders
+        register_fieldclass(CustomField, IntOrNone)
+        self.assertEqual(get_encoder(f), IntOrNone)
+        self.assertIsNot(get_encoder(ArrayField(CustomField())), array_enc)
+
 
 class TestEncoderOverrides(TestCase):
     @property
@@ -3,13 +3,18 @@ import sys
 from threading import Thread
 from io import BytesIO
 from binascii import b2a_hex
-from operator import attrgetter
+from functools import lru_cache
+from inspect import getattr_static
+from operator import attrgetter, itemgetter
+from struct import Struct, error as StructError
 from decimal import Decimal as Decimal
 from datetime import date, datetime, timedelta, time as dt_time
 from json import dumps
 from uuid import UUID
-from django.db import connections, transaction, models
+from django.db import connections, transaction, models, DataError
 from django.db.models.fields.related import RelatedField
+from django.db.models.fields.related_descriptors import ForeignKeyDeferredAttribute
+from django.db.models.query_utils import DeferredAttribute
 from django.contrib.postgres.fields import (HStoreField, ArrayField, IntegerRangeField,
     BigIntegerRangeField, DecimalRangeField, DateTimeRangeField, DateRangeField)
 from psycopg2.extras import Range
@@ -99,11 +104,29 @@ def text_escape(v: str) -> str:
     This does all basic TEXT escaping. For nested types as of hstore
     or in arrays, array_escape must be applied on top.
     """
+    # fast path: isprintable is False for all control chars in question
+    # (exact str only, replace turns str subclasses like enums into plain str)
+    if v.__class__ is str and '\\' not in v and v.isprintable():
+        return v
     return (v.replace('\\', '\\\\')
         .replace('\b', '\\b').replace('\f', '\\f').replace('\n', '\\n')
         .replace('\r', '\\r').replace('\t', '\\t').replace('\v', '\\v'))
 
 
+def text_escape_nested(v: str) -> str:
+    """
+    Escape and quote str data for nested types in one go.
+
+    Same as ``array_escape(text_escape(v))``, but operates
+    on the raw string without the intermediate TEXT escaping.
+    """
+    if '\\' not in v and '"' not in v and v.isprintable():
+        return '"' + v + '"'
+    return ('"' + v.replace('\\', '\\\\\\\\').replace('"', '\\\\"')
+        .replace('\b', '\\b').replace('\f', '\\f').replace('\n', '\\n')
+        .replace('\r', '\\r').replace('\t', '\\t').replace('\v', '\\v') + '"')
+
+
 
 # Rules for nested types:
 # - a backslash in nested strings needs 2x2 escaping, e.g. \ --> \\ --> \\\\
@@ -120,9 +143,12 @@ def array_escape(v: Any) -> str:
     To meet the nested rules above, the data must already be escaped from
     text_escape, e.g. \ --> text_escape --> \\ --> array_escape --> \\\\.
     """
-    if not isinstance(v, str):
+    if v.__class__ is not str:
         v = str(v)
-    return '"' + v.replace('\\\\', '\\\\\\\\').replace('"', '\\\\"') + '"'
+    # skip the replace passes for the common case of nothing to escape
+    if '\\' in v or '"' in v:
+        v = v.replace('\\\\', '\\\\\\\\').replace('"', '\\\\"')
+    return '"' + v + '"'
 
 
 # TODO: move the interface description into proper place...
@@ -139,14 +165,22 @@ Field value encoding for postgres' TEXT format happens in 2 main steps:
     Once the row is finished, it gets encoded to bytes by the selected encoding.
 
 - byte stage:
-    The bytes are written in 64k chunks to a file object digested by
-    psycopg2's copy_from function, either directly or threaded for bigger payloads.
+    The row bytes are collected and written in ~64k chunks to a file object
+    digested by psycopg2's copy_from function. Payloads up to
+    ``COPY_THREAD_THRESHOLD`` get sent with a single copy_from call,
+    bigger ones are streamed through a pipe into a threaded copy_from.
     If an encoder marked its data as lazy, the encoders lazy part gets called
     and writes its data directly into the file object.
 
 Within the default encoders the lazy encoding is only used for binary fields to
 avoid costly forth and back unicode to bytes encoding of potentially big data.
 
+If all columns use default encoders and postgres types listed in
+``BINARY_ENCODERS`` and ``BINARY_TYPES``, the rows are built in postgres'
+BINARY format instead (see ``binary_row_factory``). Then the field encoders
+only run for values not matching the exact python type, and lazy encoding
+is not used. The byte stage stays the same.
+
 
 Field Encoder
 
@@ -194,7 +228,8 @@ Encoder Registration
 
 On startup django's standard field types are globally mapped to default encoders.
 With ``register_fieldclass`` the encoders can be changed, or encoders be registered
-for a custom field type.
+for a custom field type. Encoder lookups are cached, thus ``ENCODERS`` should not be
+changed directly.
 
 Furthermore encoders can be overridden for individual `copy_update` calls with
 ``field_encoders``.
@@ -204,9 +239,9 @@ Array Support
 
 The default encoder implementations do not hardcode array support, but use
 the factory function ``array_factory`` instead. The factory should be generic enough
-to be used with custom encoders as well. Currently the factory has to re-run for every
-arrayfield. Furthermore the empty and balance checks are not further optimised yet.
-Thus arrayfields have some performance penalty currently.
+to be used with custom encoders as well. Array encoders for registered fields are
+cached by ``get_encoder``. The empty and balance checks are not further optimised yet,
+thus arrayfields have some performance penalty currently.
 """
 
 def encoder(func: EncoderProto) -> FieldEncoder[EncoderProto]:
@@ -239,6 +274,12 @@ def IntOrNone(v: Any, fname: str, lazy: List[Any]):
 IntOrNone.array_escape = False
 
 
+# byte length above which binary data gets hex encoded lazily in the byte stage
+# (measured: lower values slow down mid-sized values, as the lazy handling
+# costs more than the unicode roundtrip of the hex digits)
+BINARY_LAZY_THRESHOLD = 4096
+
+
 def _lazy_binary(f: BinaryIO, v: Union[memoryview, bytes]) -> None:
     length = len(v)
     if length <= 65536:
@@ -258,11 +299,11 @@ def Binary(v: Any, fname: str, lazy: List[Any]):
     Binary data is transmitted in Postgres' HEX format, thus a single byte
     creates 2 hex digits in the transport representation.
 
-    If bytelength is >4096, the encoding is post-poned to the byte stage
-    to avoid unicode forth and back conversion of hex digits.
+    If bytelength is >BINARY_LAZY_THRESHOLD, the encoding is post-poned to the
+    byte stage to avoid unicode forth and back conversion of hex digits.
     """
     if isinstance(v, (memoryview, bytes)):
-        if len(v) > 4096:
+        if len(v) > BINARY_LAZY_THRESHOLD:
             lazy.append((_lazy_binary, v))
             return '\\\\x' + LAZY_PLACEHOLDER
         return '\\\\x' + v.hex()
@@ -275,7 +316,7 @@ def BinaryOrNone(v: Any, fname: str, lazy: List[Any]):
     if v is None:
         return NULL
     if isinstance(v, (memoryview, bytes)):
-        if len(v) > 4096:
+        if len(v) > BINARY_LAZY_THRESHOLD:
             lazy.append((_lazy_binary, v))
             return '\\\\x' + LAZY_PLACEHOLDER
         return '\\\\x' + v.hex()
@@ -485,6 +526,26 @@ def UuidOrNone(v: Any, fname: str, lazy: List[Any]):
 UuidOrNone.array_escape = False
 
 
+def hstore_items(v: Dict[Any, Any], fname: str) -> str:
+    """Quoted TEXT representation of hstore items."""
+    parts = []
+    for k, v in v.items():
+        if not isinstance(k, str):
+            raise TypeError(f'expected type {str} for keys of field "{fname}"')
+        if v is None:
+            parts.append(f'{text_escape_nested(k)}=>{SQL_NULL}')
+            continue
+        if not isinstance(v, str):
+            raise TypeError(f'expected type {str} or None for values of field "{fname}"')
+        # fast path: nothing to escape in key and value (checked in one go)
+        kv = k + v
+        if '\\' not in kv and '"' not in kv and kv.isprintable():
+            parts.append('"' + k + '"=>"' + v + '"')
+        else:
+            parts.append(text_escape_nested(k) + '=>' + text_escape_nested(v))
+    return ','.join(parts)
+
+
 @encoder
 def HStore(v: Any, fname: str, lazy: List[Any]):
     """
@@ -495,17 +556,7 @@ def HStore(v: Any, fname: str, lazy: List[Any]):
     in the form: ``"key"=>"value with \\"double quotes\\""``.
     """
     if isinstance(v, dict):
-        parts = []
-        for k, v in v.items():
-            if not isinstance(k, str):
-                raise TypeError(f'expected type {str} for keys of field "{fname}"')
-            if v is not None and not isinstance(v, str):
-                raise TypeError(f'expected type {str} or None for values of field "{fname}"')
-            parts.append(
-                f'{array_escape(text_escape(k))}=>'
-                f'{SQL_NULL if v is None else array_escape(text_escape(v))}'
-            )
-        return ','.join(parts)
+        return hstore_items(v, fname)
     raise TypeError(f'expected type {dict} for field "{fname}", got {type(v)}')
 
 
@@ -515,17 +566,7 @@ def HStoreOrNone(v: Any, fname: str, lazy: List[Any]):
     if v is None:
         return NULL
     if isinstance(v, dict):
-        parts = []
-        for k, v in v.items():
-            if not isinstance(k, str):
-                raise TypeError(f'expected type {str} for keys of field "{fname}"')
-            if v is not None and not isinstance(v, str):
-                raise TypeError(f'expected type {str} or None for values of field "{fname}"')
-            parts.append(
-                f'{array_escape(text_escape(k))}=>'
-                f'{SQL_NULL if v is None else array_escape(text_escape(v))}'
-            )
-        return ','.join(parts)
+        return hstore_items(v, fname)
     raise TypeError(f'expected type {dict} or None for field "{fname}", got {type(v)}')
 
 
@@ -670,7 +711,7 @@ def array_factory(encoder, depth=1, null=False) -> FieldEncoder:
     return encode_array
 
 
-# global field type -> encoder mapping
+# global field type -> encoder mapping (change with register_fieldclass only)
 ENCODERS: Dict[Type[models.Field], Tuple[FieldEncoder, FieldEncoder]] = {
     models.AutoField: (Int, IntOrNone),
     models.BigAutoField: (Int, IntOrNone),
@@ -724,8 +765,28 @@ def register_fieldclass(
 
     If only one encoder is provided, it will be used for both field settings.
     In that case make sure, that the encoder correctly translates None values.
+
+    Always use this function to change encoders, as it also resets the cached
+    encoder lookups.
     """
     ENCODERS[field_cls] = (encoder, encoder_none or encoder)
+    _encoder_for_class.cache_clear()
+    _array_encoder.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _encoder_for_class(field_cls: Type[models.Field], null: bool) -> Optional[FieldEncoder]:
+    """Registered encoder of the first fieldclass in ``field_cls.__mro__`` (cached)."""
+    for cls in field_cls.__mro__:
+        enc = ENCODERS.get(cls)
+        if enc:
+            return enc[null]
+    return None
+
+
+# array encoders for get_encoder (only cached here, as the keys
+# are limited to registered encoders)
+_array_encoder = lru_cache(maxsize=None)(array_factory)
 
 
 def get_encoder(field: models.Field, null: Optional[bool] = None) -> FieldEncoder:
@@ -735,40 +796,348 @@ def get_encoder(field: models.Field, null: Optional[bool] = None) -> FieldEncode
     if isinstance(field, RelatedField):
         return get_encoder(field.target_field, null)
     if isinstance(field, ArrayField):
-        # TODO: cache array encoder for later calls?
         base = field.base_field
         depth = 1
         while isinstance(base, ArrayField):
             base = base.base_field
             depth += 1
-        return array_factory(get_encoder(base), depth, null)
-    for cls in type(field).__mro__:
-        enc = ENCODERS.get(cls)
-        if enc:
-            return enc[null]
+        return _array_encoder(get_encoder(base), depth, null)
+    enc = _encoder_for_class(type(field), null)
+    if enc:
+        return enc
     raise NotImplementedError(f'no suitable encoder found for field {field}')
 
 
-def write_lazy(f: BinaryIO, data: bytearray, stack: List[Any]) -> None:
-    """Execute lazy field encoders."""
+def write_lazy(f: BinaryIO, data: bytes, stack: List[Any]) -> None:
+    """
+    Execute lazy field encoders.
+
+    The placeholder search always resumes from the last position,
+    thus ``data`` gets scanned only once in total.
+    """
     m = memoryview(data)
+    index = data.index
+    write = f.write
     idx = 0
     for writer, byte_object in stack:
         old = idx
-        idx = data.index(LAZY_PLACEHOLDER_BYTE, idx)
-        f.write(m[old:idx])
+        idx = index(LAZY_PLACEHOLDER_BYTE, idx)
+        write(m[old:idx])
         writer(f, byte_object)
         idx += 1
-    f.write(m[idx:])
+    write(m[idx:])
+
+
+# max. columns for a generated row builder
+MAX_GENERATED_COLUMNS = 64
+
+
+# default encoders, that get inlined into generated row builders:
+# encoder -> (exact value type, optional str conversion)
+# values of the exact type skip the encoder call, any other value
+# (None, subclasses, wrong types) still runs through the encoder
+# NOTE: no unchecked/trusted mode skipping the type test - it only saves
+# ~12ns per cell, while a single wrong typed value (e.g. str with a tab
+# in an int field) would silently shift data into other columns or rows
+# NOTE: str() of Decimal/date/datetime/time is 2-9x faster than psycopg2's
+# adapt(v).getquoted(), which also appends sql casts like ::date
+INLINE_ENCODERS: Dict[Any, Tuple[type, Optional[Callable[[Any], str]]]] = {
+    Int: (int, None),
+    IntOrNone: (int, None),
+    Boolean: (bool, None),
+    BooleanOrNone: (bool, None),
+    Date: (date, None),
+    DateOrNone: (date, None),
+    Datetime: (datetime, None),
+    DatetimeOrNone: (datetime, None),
+    Numeric: (Decimal, None),
+    NumericOrNone: (Decimal, None),
+    Duration: (timedelta, None),
+    DurationOrNone: (timedelta, None),
+    Float: (float, None),
+    FloatOrNone: (float, None),
+    Text: (str, text_escape),
+    TextOrNone: (str, text_escape),
+    Time: (dt_time, None),
+    TimeOrNone: (dt_time, None),
+    Uuid: (UUID, None),
+    UuidOrNone: (UUID, None),
+}
+
+
+def row_factory(
+    get: Callable[[Any], Any],
+    encs: List[Any],
+    fnames: Tuple[str],
+    encoding: str
+) -> Callable[[models.Model, List[Any]], bytes]:
+    """
+    Create a row builder, that turns a model instance into one line
+    of TEXT format bytes (incl. the trailing newline).
+
+    The builder gets specialized on the column count and encoders
+    by code generation to avoid per cell zip, list and format overhead.
+    Encoders listed in ``INLINE_ENCODERS`` get inlined as type check.
+    Falls back to a generic builder for tables wider than
+    ``MAX_GENERATED_COLUMNS``.
+    """
+    if len(encs) > MAX_GENERATED_COLUMNS:
+        def build_row(o: models.Model, lazy: List[Any]) -> bytes:
+            return ('\t'.join([
+                f'{enc(el, fname, lazy)}'
+                for enc, el, fname in zip(encs, get(o), fnames)
+            ]) + '\n').encode(encoding)
+        return build_row
+    namespace: Dict[str, Any] = {'get': get, 'encoding': encoding}
+    cells = []
+    args = []
+    for i, (enc, fname) in enumerate(zip(encs, fnames)):
+        namespace[f'e{i}'] = enc
+        namespace[f'f{i}'] = fname
+        args.append(f'e{i}=e{i},f{i}=f{i}')
+        call = f'e{i}(v{i},f{i},lazy)'
+        inline = INLINE_ENCODERS.get(enc)
+        if inline:
+            namespace[f't{i}'], namespace[f'c{i}'] = inline
+            args.append(f't{i}=t{i}')
+            value = f'v{i}'
+            if inline[1]:
+                args.append(f'c{i}=c{i}')
+                value = f'c{i}(v{i})'
+            elif inline[0] is not int:
+                # str() skips the __format__ dispatch for the exact types
+                # (exact int is already fast-pathed by f-strings)
+                value = f'str(v{i})'
+            call = f'{value} if v{i}.__class__ is t{i} else {call}'
+        # note: encoder results are formatted as usual, format() and str()
+        # differ for some types (e.g. IntEnum before python 3.11)
+        cells.append(f'{{{call}}}')
+    # note: getters return a plain value for a single attribute,
+    # thus v0=get(o) works for both cases
+    # NOTE: encoding the whole row once is ~1.5x faster than joining per cell
+    # encoded bytes, str.encode also skips the codec lookup for utf-8/latin-1/ascii
+    values = ','.join(f'v{i}' for i in range(len(encs)))
+    row = '\\t'.join(cells)
+    src = (
+        f'def build_row(o,lazy,get=get,encoding=encoding,{",".join(args)}):\n'
+        f'    {values}=get(o)\n'
+        f'    return f"{row}\\n".encode(encoding)\n'
+    )
+    exec(src, namespace)
+    return namespace['build_row']
+
+
+# BINARY format
+# For column sets, that only consist of the following default encoders and
+# postgres types, COPY FROM uses the BINARY format, which avoids the string
+# formatting and escaping (and hex doubling of bytea) of the TEXT format.
+# Any other column (custom encoders, json, numeric, timestamp etc.)
+# enforces the TEXT format for the whole copy_from call.
+
+# default encoders with BINARY support: encoder -> value type
+BINARY_ENCODERS: Dict[Any, type] = {
+    Int: int,
+    IntOrNone: int,
+    Binary: bytes,
+    BinaryOrNone: bytes,
+    Boolean: bool,
+    BooleanOrNone: bool,
+    Date: date,
+    DateOrNone: date,
+    Float: float,
+    FloatOrNone: float,
+    Text: str,
+    TextOrNone: str,
+    Uuid: UUID,
+    UuidOrNone: UUID,
+}
+
+# postgres types with BINARY support: db type -> (value type, cell expression)
+# The cell expression creates length + value bytes from value ``{0}``.
+BINARY_TYPES: Dict[str, Tuple[type, str]] = {
+    'smallint': (int, 'I2(2,{0})'),
+    'smallserial': (int, 'I2(2,{0})'),
+    'integer': (int, 'I4(4,{0})'),
+    'serial': (int, 'I4(4,{0})'),
+    'bigint': (int, 'I8(8,{0})'),
+    'bigserial': (int, 'I8(8,{0})'),
+    'boolean': (bool, 'B1(1,{0})'),
+    'date': (date, 'I4(4,{0}.toordinal()-730120)'),   # days since 2000-01-01
+    'double precision': (float, 'F8(8,{0})'),
+    'uuid': (UUID, 'U16+{0}.bytes'),
+    'bytea': (bytes, 'L(len({0}))+{0}'),
+    'text': (str, 'S({0})'),
+    'varchar': (str, 'S({0})'),
+}
+
+def _no_bool(cast: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    # Int and Float pass along bool, which postgres rejects in TEXT format
+    def no_bool(v: Any) -> Any:
+        if isinstance(v, bool):
+            raise ValueError('bool is not a number')
+        return cast(v)
+    return no_bool
+
+
+# value types, that may pass an encoder check without exact type match
+BINARY_CASTS: Dict[type, Callable[[Any], Any]] = {
+    int: _no_bool(int),
+    bytes: bytes,
+    bool: bool,
+    date: lambda v: v,
+    float: _no_bool(float),
+    str: str.__str__,     # plain str value for subclasses (str() of str mixin enums differs)
+    UUID: lambda v: v,
+}
+
+BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + b'\x00' * 8
+BINARY_TRAILER = b'\xff\xff'
+BINARY_NULL = b'\xff\xff\xff\xff'
+
+
+def binary_row_factory(
+    get: Callable[[Any], Any],
+    encs: List[Any],
+    fnames: Tuple[str],
+    types: Sequence[str],
+    encoding: str
+) -> Optional[Callable[[models.Model, List[Any]], bytes]]:
+    """
+    Create a row builder for postgres' BINARY format.
+
+    Returns None, if any of the columns is not supported by the
+    BINARY format (see ``BINARY_ENCODERS`` and ``BINARY_TYPES``).
+
+    Values of the exact type are packed directly. Everything else runs through
+    the field encoder first to get the same NULL handling and type errors
+    as with the TEXT format. Values not fitting into the column type
+    (e.g. integer overflow) raise a ``DataError`` naming the field.
+    Contiguous ``memoryview`` values for bytea columns (as loaded by django)
+    are packed directly as well.
+    """
+    if len(encs) > MAX_GENERATED_COLUMNS:
+        return None
+    length_pack = Struct('>i').pack
+    def S(v: str) -> bytes:
+        b = v.encode(encoding)
+        return length_pack(len(b)) + b
+    namespace: Dict[str, Any] = {
+        'get': get,
+        'I2': Struct('>ih').pack,
+        'I4': Struct('>ii').pack,
+        'I8': Struct('>iq').pack,
+        'B1': Struct('>i?').pack,
+        'F8': Struct('>id').pack,
+        'U16': length_pack(16),
+        'L': length_pack,
+        'S': S,
+        'H': Struct('>h').pack(len(encs))
+    }
+    cells = []
+    # bind packers as default args for fast local lookups
+    args = [f'{k}={k}' for k in namespace]
+    for i, (enc, fname, db_type) in enumerate(zip(encs, fnames, types)):
+        value_type = BINARY_ENCODERS.get(enc)
+        bin_type, cell = BINARY_TYPES.get(db_type.split('(')[0], (None, ''))
+        if value_type is None or value_type is not bin_type:
+            return None
+        namespace[f't{i}'] = value_type
+        namespace[f'c{i}'] = _binary_fallback(enc, fname, db_type,
+            BINARY_CASTS[value_type], eval(f'lambda v: {cell.format("v")}', namespace))
+        args.append(f't{i}=t{i},c{i}=c{i}')
+        fallback = f'c{i}(v{i})'
+        if value_type is bytes:
+            fallback = (f'L(v{i}.nbytes)+v{i} if v{i}.__class__ is memoryview '
+                f'and v{i}.contiguous else {fallback}')
+        cells.append(f'({cell.format(f"v{i}")} if v{i}.__class__ is t{i} else {fallback})')
+    values = ','.join(f'v{i}' for i in range(len(encs)))
+    fallbacks = ','.join(f'(c{i},v{i})' for i in range(len(encs)))
+    namespace['StructError'] = StructError
+    args.append('StructError=StructError')
+    # on pack errors rerun the cells through the fallbacks to raise
+    # a DataError for the offending field
+    src = (
+        f'def build_row(o,lazy,{",".join(args)}):\n'
+        f'    {values}=get(o)\n'
+        f'    try:\n'
+        f'        return b"".join((H,{",".join(cells)}))\n'
+        f'    except StructError:\n'
+        f'        for c,v in ({fallbacks},):\n'
+        f'            c(v)\n'
+        f'        raise\n'
+    )
+    exec(src, namespace)
+    return namespace['build_row']
+
+
+def _binary_fallback(
+    enc: FieldEncoder,
+    fname: str,
+    db_type: str,
+    cast: Callable[[Any], Any],
+    pack: Callable[[Any], bytes]
+) -> Callable[[Any], bytes]:
+    def fallback(v: Any) -> bytes:
+        # run encoder for proper NULL handling and type errors
+        enc(v, fname, [])
+        if v is None:
+            return BINARY_NULL
+        try:
+            return pack(cast(v))
+        except (StructError, OverflowError, ValueError) as e:
+            raise DataError(f'invalid value {v!r} for type {db_type} of field "{fname}": {e}') from e
+    return fallback
+
 
+# payload size in bytes, above which copy_from switches to threaded processing
+# (smaller payloads are sent with a single copy_from call from the main thread)
+# NOTE: no parallel COPYs from multiple connections - the pipe consumer already
+# waits on the row encoding (GIL bound), and the UPDATE dominates the runtime.
+# Also temporary tables are session local, sharding would need real tables
+# committed outside of the calling transaction.
+COPY_THREAD_THRESHOLD = 65535
 
-def threaded_copy(
+
+# field descriptors, that return the instance __dict__ value unaltered
+PLAIN_DESCRIPTORS = (DeferredAttribute, ForeignKeyDeferredAttribute)
+
+
+def field_getter(model: Type[models.Model], attnames: Sequence[str]) -> Callable[[Any], Any]:
+    """
+    Getter for model field values, reading ``attnames`` from the instance
+    ``__dict__`` with a single ``itemgetter`` call (faster than ``attrgetter``).
+
+    Falls back to ``attrgetter`` for instances missing some values in
+    ``__dict__`` (deferred fields). Models with custom field descriptors
+    always use ``attrgetter``.
+    """
+    ag = attrgetter(*attnames)
+    if any(type(getattr_static(model, attname, None)) not in PLAIN_DESCRIPTORS
+            for attname in attnames):
+        return ag
+    ig = itemgetter(*attnames)
+    def get(o):
+        try:
+            return ig(o.__dict__)
+        except KeyError:
+            return ag(o)
+    return get
+
+
+# NOTE: no psycopg3 support (cursor.copy) - setup.py pins Django<4.2,
+# which only ships the psycopg2 backend
+def copy_file(
     c: CursorWrapper,
     fr: BinaryIO,
     tname: str,
-    columns: Tuple[str]
+    columns: Tuple[str],
+    binary: bool = False
 ) -> None:
-    c.copy_from(fr, tname, size=65536, columns=columns)
+    if binary:
+        cols = ','.join(f'"{col}"' for col in columns)
+        c.copy_expert(f'COPY "{tname}" ({cols}) FROM STDIN WITH BINARY', fr, 65536)
+    else:
+        c.copy_from(fr, tname, size=65536, columns=columns)
 
 
 def copy_from(
@@ -777,48 +1146,60 @@ def copy_from(
     data: Sequence[models.Model],
     fnames: Tuple[str],
     columns: Tuple[str],
-    get: attrgetter,
+    get: Callable[[Any], Any],
     encs: List[Any],
-    encoding: str
+    encoding: str,
+    types: Optional[Sequence[str]] = None
 ) -> None:
     """
-    Optimized call of cursor.copy_from with threading for bigger change data.
+    Optimized call of cursor.copy_from with threading for bigger change data
+    (see ``COPY_THREAD_THRESHOLD``).
+
+    If the postgres column ``types`` are given, the BINARY format is used
+    where possible (see ``binary_row_factory``).
     """
     use_thread = False
-    payload = bytearray()
+    chunks: List[bytes] = []
+    size = 0
+    limit = COPY_THREAD_THRESHOLD
     lazy: List[Any] = []
+    build_row = types and binary_row_factory(get, encs, fnames, types, encoding)
+    binary = bool(build_row)
+    if binary:
+        chunks.append(BINARY_HEADER)
+        size = len(BINARY_HEADER)
+    else:
+        build_row = row_factory(get, encs, fnames, encoding)
     for o in data:
-        payload += '\t'.join([
-            f'{enc(el, fname, lazy)}'
-            for enc, el, fname in zip(encs, get(o), fnames)
-        ]).encode(encoding)
-        payload += b'\n'
-        if len(payload) > 65535:
-            # if we exceed 64k, switch to threaded chunkwise processing
+        row = build_row(o, lazy)
+        chunks.append(row)
+        size += len(row)
+        if size > limit:
+            # if we exceed the threshold, switch to threaded chunkwise processing
             if not use_thread:
+                limit = 65535
                 r, w = os.pipe()
                 fr = os.fdopen(r, 'rb')
                 fw = os.fdopen(w, 'wb')
                 t = Thread(
-                    target=threaded_copy,
-                    args=[c.connection.cursor(), fr, tname, columns]
+                    target=copy_file,
+                    args=[c.connection.cursor(), fr, tname, columns, binary]
                 )
                 t.start()
                 use_thread = True
+            # NOTE: os.writev of the chunks is not faster than join + write here
+            # (limited to IOV_MAX buffers, partial writes on the 64k pipe buffer)
+            payload = b''.join(chunks)
+            chunks.clear()
+            size = 0
             if lazy:
                 write_lazy(fw, payload, lazy)
                 lazy.clear()
-                payload = bytearray()
             else:
-                length = len(payload)
-                m = memoryview(payload)
-                pos = 0
-                while length - pos > 65535:
-                    # write all full 64k chunks (in case some line payload went overboard)
-                    fw.write(m[pos:pos+65536])
-                    pos += 65536
-                # carry remaining data forward
-                payload = bytearray(m[pos:])
+                fw.write(payload)
+    if binary:
+        chunks.append(BINARY_TRAILER)
+    payload = b''.join(chunks)
     if use_thread:
         if payload:
             if lazy:
@@ -838,8 +1219,10 @@ def copy_from(
             write_lazy(f, payload, lazy)
             f.seek(0)
         else:
+            # no buffer pooling here: BytesIO shares the bytes object
+            # initially, while reusing a BytesIO would copy the payload
             f = BytesIO(payload)
-        c.copy_from(f, tname, size=65536, columns=columns)
+        copy_file(c, f, tname, columns, binary)
         f.close()
 
 
@@ -898,14 +1281,15 @@ def copy_update(
             for f in all_fields])
     encs = ([field_encoders.get(f.attname, get_encoder(f)) for f in all_fields]
         if field_encoders else [get_encoder(f) for f in all_fields])
-    get = attrgetter(*attnames)
+    get = field_getter(model, attnames)
     rows_updated = 0
     with transaction.atomic(using=conn.alias, savepoint=False), conn.cursor() as c:
         temp = f'temp_cu_{model._meta.db_table}'
         c.execute(f'DROP TABLE IF EXISTS "{temp}"')
         c.execute(f'CREATE TEMPORARY TABLE "{temp}" ({create_columns(column_def)})')
         copy_from(c, temp, objs, attnames, colnames, get, encs,
-            encoding or CONNECTION_ENCODINGS[c.connection.encoding])
+            encoding or CONNECTION_ENCODINGS[c.connection.encoding],
+            [db_type for _, db_type in column_def])
         # optimization (~6x speedup in ./manage.py perf for 10 instances):
         # for small changesets ANALYZE is much more expensive than
         # a sequential scan of the temp table
@@ -90,7 +90,9 @@ class FastUpdateQuerySet(QuerySet):
         a temporary table and run the update from there.
 
         For the data transport postgres' TEXT format is used. For this the field values
-        get encoded by special encoders. The encoders are globally registered for
+        get encoded by special encoders. If all fields are of simple types with default
+        encoders (integers, float, boolean, date, uuid, binary and text types),
+        the faster BINARY format is used instead. The encoders are globally registered for
         django's standard field types (works similar to `get_db_prep_value`).
         With ``field_encoders`` custom encoders can be attached to update fields
         for a single call. This might come handy for additional conversion work or